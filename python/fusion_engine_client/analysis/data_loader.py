@@ -10,6 +10,7 @@ import scipy as sp
 
 from ..messages import *
 from ..messages.timestamp import is_gps_time
+from ..parsers import fast_indexer
 from ..parsers.file_index import FileIndex
 from ..parsers.mixed_log_reader import MixedLogReader
 from ..utils import trace as logging
@@ -32,6 +33,28 @@ class MessageData(object):
         self.messages_bytes = []
         self.message_index = []
 
+    def get_p1_time_sec(self) -> np.ndarray:
+        """!
+        @brief Get the P1 timestamps of all messages as a numpy array.
+
+        Unlike @ref to_numpy(), this function is supported for all message types, and does not modify this object.
+
+        @return A numpy array containing the P1 time of each message (in seconds), or `nan` for messages that do not
+                have P1 time.
+        """
+        return np.fromiter((np.nan if t is None else float(t) for t in (m.get_p1_time() for m in self.messages)),
+                           dtype=float, count=len(self.messages))
+
+    def get_system_time_sec(self) -> np.ndarray:
+        """!
+        @brief Get the system timestamps of all messages as a numpy array.
+
+        @return A numpy array containing the system time of each message (in seconds), or `nan` for messages that do
+                not have system time.
+        """
+        return np.fromiter((np.nan if t is None else t for t in (m.get_system_time_sec() for m in self.messages)),
+                           dtype=float, count=len(self.messages))
+
     def to_numpy(self, remove_nan_times: bool = True):
         """!
         @brief Convert the raw FusionEngine message data into numpy arrays that can be used for data analysis.
@@ -205,15 +228,28 @@ class DataLoader(object):
         # the log, if any (profiling data, etc.). Unlike P1 time, since the index file does not contain system
         # timestamps, we have to do a read() even if an index exists. read() will use the index to at least speed up the
         # read operation.
+        #
+        # If we already found system t0 for this (unmodified) file, it is stored along with the cached index and we can
+        # skip the read().
         if self._need_system_t0:
-            self.read(require_system_time=True, max_messages=1, max_bytes=1 * 1024 * 1024,
-                      disable_index_generation=True, ignore_cache=True, show_progress=False)
+            input_path = self.reader.input_file.name
+            have_system_t0, system_t0_ns = fast_indexer.get_cached_system_t0_ns(input_path)
+            if have_system_t0:
+                self.system_t0_ns = system_t0_ns
+                if self.system_t0_ns is not None:
+                    self.system_t0 = self.system_t0_ns * 1e-9
+                self._need_system_t0 = False
+            else:
+                self.read(require_system_time=True, max_messages=1, max_bytes=1 * 1024 * 1024,
+                          disable_index_generation=True, ignore_cache=True, show_progress=False)
+                fast_indexer.set_cached_system_t0_ns(input_path, self.system_t0_ns)
 
     def close(self):
         """!
         @brief Close the file.
         """
         if self.reader is not None:
+            self.reader.close()
             self.reader = None
 
     def read(self, *args, **kwargs) \
@@ -422,6 +458,16 @@ class DataLoader(object):
         if need_t0 or need_system_t0:
             logger.debug('Establishing t0. Postponing reader filter setup.')
             filters_applied = False
+
+            # While searching for t0, we only need to look at messages that were requested, or that may contain the
+            # timestamps we're looking for. The reader can skip everything else using the index, without reading or
+            # decoding it.
+            search_message_types = set(needed_message_types)
+            if need_t0:
+                search_message_types |= messages_with_p1_time
+            if need_system_t0:
+                search_message_types |= messages_with_system_time
+            self.reader.filter_in_place(search_message_types)
         else:
             filters_applied = True
 
@@ -833,10 +879,12 @@ class DataLoader(object):
         # insert mode, make a list of all unique P1 timestamps.
         info_by_type = {}
         time_set = None
+        all_times = []
         for type, entry in data.items():
             default = entry.message_class()
             if 'p1_time' in default.__dict__ and (message_types is None or entry.message_type in message_types):
-                p1_time = np.array([float(m.p1_time) for m in entry.messages])
+                p1_time = np.fromiter((float(m.p1_time) for m in entry.messages), dtype=float,
+                                      count=len(entry.messages))
                 info_by_type[type] = {'p1_time': p1_time, 'messages': entry.messages, 'class': entry.message_class}
 
                 if mode == TimeAlignmentMode.DROP:
@@ -845,35 +893,33 @@ class DataLoader(object):
                     else:
                         time_set = np.intersect1d(time_set, p1_time)
                 else:
-                    if time_set is None:
-                        time_set = p1_time
-                    else:
-                        time_set = np.hstack((time_set, p1_time))
+                    all_times.append(p1_time)
 
         # In insertion mode, insert default-constructed objects for any missing timestamps.
         if mode == TimeAlignmentMode.INSERT:
-            time_set = np.unique(time_set)
+            # Combine the timestamps for all message types in a single call, rather than growing the array one message
+            # type at a time.
+            time_set = np.unique(np.concatenate(all_times)) if len(all_times) > 0 else np.array([])
 
             for type, entry in info_by_type.items():
-                # Locate the timestamps where we do/do not have data. For timestamps with data we store the index of the
-                # corresponding message. For timestamps without we store -1.
-                _, idx, all_idx = np.intersect1d(entry['p1_time'], time_set, return_indices=True)
-                message_indices = np.full_like(time_set, -1, dtype=int)
-                message_indices[all_idx] = idx
+                # Locate the timestamps where we have data, and the index of the corresponding message for each.
+                _, message_idx, time_idx = np.intersect1d(entry['p1_time'], time_set, return_indices=True)
 
-                # Now interlace messages with defaults as needed.
+                # Place the existing messages at their aligned locations, then fill in the remaining timestamps with
+                # default-constructed messages.
                 messages = entry['messages']
+                aligned_messages = [None] * len(time_set)
+                for i, j in zip(time_idx, message_idx):
+                    aligned_messages[i] = messages[j]
+
                 cls = entry['class']
+                missing_idx = np.setdiff1d(np.arange(len(time_set)), time_idx, assume_unique=True)
+                for i in missing_idx:
+                    default = cls()
+                    default.p1_time = time_set[i]
+                    aligned_messages[i] = default
 
-                def _get_value(i):
-                    message_idx = message_indices[i]
-                    if message_idx >= 0:
-                        return messages[message_idx]
-                    else:
-                        default = cls()
-                        default.p1_time = time_set[i]
-                        return default
-                data[type].messages = [_get_value(i) for i in range(len(time_set))]
+                data[type].messages = aligned_messages
         # In drop mode, drop messages that aren't present across _all_ message types.
         elif mode == TimeAlignmentMode.DROP:
             for type, entry in info_by_type.items():
@@ -222,7 +222,14 @@ class MessageHeader:
     SYNC = bytes((SYNC0, SYNC1))
 
     _FORMAT = '<BBHIBBHIII'
-    _SIZE: int = struct.calcsize(_FORMAT)
+    _STRUCT = struct.Struct(_FORMAT)
+    _SIZE: int = _STRUCT.size
+
+    # The CRC field follows the sync and reserved bytes. The CRC is computed over the remainder of the header (starting
+    # with protocol_version) and the payload.
+    _CRC_OFFSET = 4
+    _CRC_STRUCT = struct.Struct('<I')
+    _CRC_START_OFFSET = _CRC_OFFSET + _CRC_STRUCT.size
 
     _MAX_EXPECTED_SIZE_BYTES = (1 << 24)
 
@@ -252,18 +259,28 @@ class MessageHeader:
         # protocol_version, then add the payload into the CRC.
         self.payload_size_bytes = len(payload)
         header_buffer = self.pack()
-        self.crc = crc32(header_buffer[8:])
+        self.crc = crc32(header_buffer[MessageHeader._CRC_START_OFFSET:])
         self.crc = crc32(payload, self.crc)
         return self.crc
 
+    def _get_field_values(self) -> tuple:
+        # The header field values, in serialized order.
+        return (MessageHeader.SYNC0, MessageHeader.SYNC1, self.reserved, self.crc, self.protocol_version,
+                self.message_version, int(self.message_type), self.sequence_number, self.payload_size_bytes,
+                self.source_identifier)
+
+    def _calculate_buffer_crc(self, buffer: bytes, offset: int = 0) -> int:
+        # Compute the CRC over a complete serialized message (header + payload) starting at the specified offset.
+        message_size_bytes = MessageHeader._SIZE + self.payload_size_bytes
+        return crc32(buffer[(offset + MessageHeader._CRC_START_OFFSET):(offset + message_size_bytes)])
+
     def validate_crc(self, buffer: bytes, offset: int = 0):
         # Sanity check the message payload length before calculating the CRC.
         if self.payload_size_bytes > MessageHeader._MAX_EXPECTED_SIZE_BYTES:
             raise ValueError('Payload length failed sanity check. [%d bytes > %d bytes]' %
                              (self.payload_size_bytes, MessageHeader._MAX_EXPECTED_SIZE_BYTES))
 
-        message_size_bytes = MessageHeader._SIZE + self.payload_size_bytes
-        crc = crc32(buffer[(offset + 8):(offset + message_size_bytes)])
+        crc = self._calculate_buffer_crc(buffer, offset)
         if crc != self.crc:
             raise ValueError('CRC mismatch. [type=%s, payload_size=%d B, expected=0x%08x, computed=0x%08x]' %
                              (self.get_type_string(), self.payload_size_bytes, self.crc, crc))
@@ -294,15 +311,13 @@ class MessageHeader:
         if payload is not None:
             self.calculate_crc(payload)
 
-        args = (MessageHeader.SYNC0, MessageHeader.SYNC1, self.reserved, self.crc, self.protocol_version,
-                self.message_version, int(self.message_type), self.sequence_number, self.payload_size_bytes,
-                self.source_identifier)
+        args = self._get_field_values()
         if buffer is None:
-            buffer = struct.pack(MessageHeader._FORMAT, *args)
+            buffer = MessageHeader._STRUCT.pack(*args)
             if payload is not None:
                 buffer += payload
         else:
-            struct.pack_into(MessageHeader._FORMAT, buffer, offset, *args)
+            MessageHeader._STRUCT.pack_into(buffer, offset, *args)
             if payload is not None:
                 offset += MessageHeader._SIZE
                 buffer[offset:offset + len(payload)] = payload
@@ -312,6 +327,31 @@ class MessageHeader:
         else:
             return self.calcsize()
 
+    def pack_in_place(self, buffer: bytearray, offset: int, payload_size_bytes: int) -> int:
+        """!
+        @brief Serialize this header into a buffer that already contains the message payload, and compute its CRC.
+
+        The payload must already be serialized in `buffer` immediately following the header location. Unlike @ref
+        pack(), this does not require the payload to be serialized into a separate `bytes` object first.
+
+        @post
+        @ref payload_size_bytes and @ref crc will be populated automatically on return.
+
+        @param buffer The buffer containing the serialized payload.
+        @param offset The offset into the buffer (in bytes) at which the message header will be written.
+        @param payload_size_bytes The size of the serialized payload (in bytes).
+
+        @return The size of the complete message (header + payload) (in bytes).
+        """
+        # Write the header with an empty CRC, then compute the CRC over the serialized content and fill it in.
+        self.reserved = 0
+        self.payload_size_bytes = payload_size_bytes
+        self.crc = 0
+        MessageHeader._STRUCT.pack_into(buffer, offset, *self._get_field_values())
+        self.crc = self._calculate_buffer_crc(buffer, offset)
+        MessageHeader._CRC_STRUCT.pack_into(buffer, offset + MessageHeader._CRC_OFFSET, self.crc)
+        return self.get_message_size()
+
     def unpack(self, buffer: bytes, offset: int = 0, validate_sync: bool = False, validate_crc: bool = False,
                warn_on_unrecognized: bool = True) -> int:
         """!
@@ -332,7 +372,7 @@ class MessageHeader:
          self.crc, self.protocol_version,
          self.message_version, message_type_int,
          self.sequence_number, self.payload_size_bytes, self.source_identifier) = \
-            struct.unpack_from(MessageHeader._FORMAT, buffer, offset)
+            MessageHeader._STRUCT.unpack_from(buffer, offset)
 
         if validate_sync and (sync0 != MessageHeader.SYNC0 or sync1 != MessageHeader.SYNC1):
             raise ValueError('Received invalid sync bytes. [sync0=0x%02x, sync1=0x%02x]' % (sync0, sync1))
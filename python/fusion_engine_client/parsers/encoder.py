@@ -37,3 +37,37 @@ class FusionEngineEncoder:
         message_data = message.pack()
 
         return header.pack(payload=message_data)
+
+    def encode_into(self, buffer: bytearray, offset: int, message: MessagePayload, source_identifier: int = 0) -> int:
+        """!
+        @brief Serialize a message with valid header and payload directly into an existing buffer.
+
+        This is equivalent to @ref encode_message(), but serializes the header and payload in place rather than
+        constructing intermediate `bytes` objects for each message. It is useful when encoding a large number of
+        messages into a single output buffer.
+
+        @param buffer The `bytearray` into which the message will be written. The buffer will be extended automatically
+               if it is not large enough to hold the message.
+        @param offset The offset into the buffer (in bytes) at which the message will be written.
+        @param message The MessagePayload to serialize.
+        @param source_identifier A numeric source identifier to associate with this message (optional).
+
+        @return The offset immediately following the serialized message.
+        """
+        # Grow the buffer once to fit the complete message, then serialize the payload directly into it.
+        payload_offset = offset + MessageHeader.calcsize()
+        end_offset = payload_offset + message.calcsize()
+        if len(buffer) < end_offset:
+            buffer.extend(bytes(end_offset - len(buffer)))
+        payload_size_bytes = message.pack(buffer=buffer, offset=payload_offset, return_buffer=False)
+        end_offset = payload_offset + payload_size_bytes
+
+        # Now write the header in front of the payload and compute the CRC.
+        header = MessageHeader(message.get_type())
+        header.message_version = message.get_version()
+        header.sequence_number = self.sequence_number
+        header.source_identifier = source_identifier
+        self.sequence_number += 1
+
+        header.pack_in_place(buffer, offset, payload_size_bytes)
+        return end_offset
@@ -1,7 +1,8 @@
+from collections import OrderedDict
 import os
 import math
 from multiprocessing import Pool, cpu_count
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 import struct
 
 import numpy as np
@@ -23,6 +24,82 @@ _PREAMBLE = struct.unpack('<H', MessageHeader.SYNC)
 
 _logger = logging.getLogger('point_one.fusion_engine.parsers.fast_indexer')
 
+class _IndexCacheEntry:
+    def __init__(self, stat: os.stat_result, index: FileIndex):
+        self.mtime_ns = stat.st_mtime_ns
+        self.size_bytes = stat.st_size
+        self.index = index
+        # Other values derived from the data file, which cannot be determined from the index alone. See
+        # get_cached_system_t0_ns().
+        self.have_system_t0 = False
+        self.system_t0_ns = None
+
+    def is_valid(self, stat: os.stat_result):
+        return self.mtime_ns == stat.st_mtime_ns and self.size_bytes == stat.st_size
+
+
+# The most recently loaded or generated indexes, keyed by the absolute path of the data file. Each entry also stores the
+# data file's modification time and size at the time it was indexed, so the cached index is only reused if the file has
+# not been changed. The cache is limited to a few files so that processing many logs in a single process does not hold
+# every index in memory. See clear_index_cache().
+_INDEX_CACHE_MAX_ENTRIES = 4
+_INDEX_CACHE: 'OrderedDict[str, _IndexCacheEntry]' = OrderedDict()
+
+
+def clear_index_cache():
+    """!
+    @brief Clear all indexes (and associated values) cached in memory by @ref fast_generate_index().
+    """
+    _INDEX_CACHE.clear()
+
+
+def _cache_index(cache_key: str, stat: os.stat_result, index: FileIndex):
+    _INDEX_CACHE[cache_key] = _IndexCacheEntry(stat, index)
+    _INDEX_CACHE.move_to_end(cache_key)
+    while len(_INDEX_CACHE) > _INDEX_CACHE_MAX_ENTRIES:
+        _INDEX_CACHE.popitem(last=False)
+
+
+def _get_cache_entry(input_path: str) -> Optional[_IndexCacheEntry]:
+    cache_key = os.path.abspath(input_path)
+    cache_entry = _INDEX_CACHE.get(cache_key)
+    if cache_entry is not None and cache_entry.is_valid(os.stat(input_path)):
+        _INDEX_CACHE.move_to_end(cache_key)
+        return cache_entry
+    else:
+        return None
+
+
+def get_cached_system_t0_ns(input_path: str) -> Tuple[bool, Optional[int]]:
+    """!
+    @brief Get the system t0 value stored with the cached index for a data file, if available.
+
+    @param input_path The path to the data file.
+
+    @return A tuple containing `True` if a value is available for the file, and the stored system t0 (in nanoseconds),
+            or `None` if the file does not contain any system timestamps.
+    """
+    cache_entry = _get_cache_entry(input_path)
+    if cache_entry is not None and cache_entry.have_system_t0:
+        return True, cache_entry.system_t0_ns
+    else:
+        return False, None
+
+
+def set_cached_system_t0_ns(input_path: str, system_t0_ns: Optional[int]):
+    """!
+    @brief Store the system t0 value for a data file along with its cached index.
+
+    If the data file does not have a cached index (or it is no longer valid), the value will not be stored.
+
+    @param input_path The path to the data file.
+    @param system_t0_ns The system t0 (in nanoseconds), or `None` if the file does not contain any system timestamps.
+    """
+    cache_entry = _get_cache_entry(input_path)
+    if cache_entry is not None:
+        cache_entry.have_system_t0 = True
+        cache_entry.system_t0_ns = system_t0_ns
+
 
 def _search_blocks_for_fe(input_path: str, block_starts: List[int]):
     """!
@@ -124,6 +201,11 @@ def fast_generate_index(
 
     This basic logic would be relatively easy to extend to do general parallel processing on messages.
 
+    @note
+    The most recently used indexes are cached in memory and reused if the same (unmodified) file is indexed again, so
+    the returned @ref FileIndex may be shared with other callers and must not be modified. Use @ref
+    clear_index_cache() to release cached indexes.
+
     @param input_path The path to the file to be read.
     @param force_reindex If `True` regenerate the index even if there's an existing file.
     @param save_index If `True` save the index to disk after generation.
@@ -132,22 +214,43 @@ def fast_generate_index(
 
     @return The loaded or generated @ref FileIndex.
     """
-    file_size = os.stat(input_path).st_size
+    stat = os.stat(input_path)
+    file_size = stat.st_size
     _logger.debug(f'File size: {int(file_size/1024/1024)}MB')
 
+    # Only indexes covering the complete file are stored in the in-memory cache.
+    cache_key = os.path.abspath(input_path)
+    cache_index = True
     if max_bytes and max_bytes < file_size:
         _logger.debug(f'Only indexing: {max_bytes/1024/1024}MB')
         file_size = max_bytes
+        cache_index = False
         if save_index:
             save_index = False
             _logger.info('Max bytes specified. Disabling saving index.')
 
     index_path = FileIndex.get_path(input_path)
+
+    # Check if this file was already indexed by this process and hasn't changed since. If so, we can skip reading the
+    # index file from disk.
+    if not force_reindex and cache_index:
+        cache_entry = _INDEX_CACHE.get(cache_key)
+        if cache_entry is not None and cache_entry.is_valid(stat):
+            _logger.debug(f'Using cached index for "{input_path}".')
+            _INDEX_CACHE.move_to_end(cache_key)
+            index = cache_entry.index
+            if save_index and not os.path.exists(index_path):
+                _logger.info(f'Saving index to "{index_path}".')
+                index.save(index_path, input_path)
+            return index
+
     # Check if index file can be loaded.
     if not force_reindex and os.path.exists(index_path):
         try:
             index = FileIndex(index_path, input_path)
             _logger.info(f'Loading existing cache: "{index_path}".')
+            if cache_index:
+                _cache_index(cache_key, stat, index)
             return index
         except ValueError as e:
             _logger.warning(f'Couldn\'t load cache "{index_path}": {str(e)}.')
@@ -186,6 +289,8 @@ def fast_generate_index(
     # with the EOF entry directly. This adds less than a second, and could be
     # avoided by reproducing the FileIndex EOF entry logic.
     index = FileIndex(data=FileIndex._from_raw(index_raw))
+    if cache_index:
+        _cache_index(cache_key, stat, index)
     if save_index:
         _logger.info(f'Saving index to "{index_path}".')
         index.save(index_path, input_path)
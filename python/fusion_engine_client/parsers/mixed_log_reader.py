@@ -92,8 +92,10 @@ class MixedLogReader(object):
         # Open the file to be read.
         if isinstance(input_file, str):
             self.input_file = open(input_file, 'rb')
+            self._owns_input_file = True
         else:
             self.input_file = input_file
+            self._owns_input_file = False
 
         input_path = self.input_file.name
         self.file_size_bytes = os.stat(input_path).st_size
@@ -111,6 +113,16 @@ class MixedLogReader(object):
         self.filtered_message_types = len(np.unique(self._original_index.type)) != \
                                         len(np.unique(self.index.type))
 
+    def close(self):
+        """!
+        @brief Close the input file.
+
+        @note
+        If the caller provided an open file object to the constructor, the file object will not be closed.
+        """
+        if self._owns_input_file:
+            self.input_file.close()
+
     def rewind(self):
         self.logger.debug('Rewinding to the start of the file.')
 
@@ -1,103 +1,150 @@
 from datetime import datetime, timezone
+import shutil
 
 from gpstime import gpstime
 import numpy as np
 import pytest
 
 from fusion_engine_client.analysis.data_loader import DataLoader, MessageData, TimeAlignmentMode
-from fusion_engine_client.messages import *
-from fusion_engine_client.parsers import FusionEngineEncoder, MixedLogReader
+from fusion_engine_client.messages import (CommandResponseMessage, EventNotificationMessage, GNSSInfoMessage,
+                                           MessageType, PoseAuxMessage, PoseMessage, Timestamp, Y2K_GPS_SEC,
+                                           Y2K_POSIX_SEC)
+from fusion_engine_client.parsers import FusionEngineEncoder, MixedLogReader, fast_indexer
 from fusion_engine_client.utils.time_range import TimeRange
 
 
+# Velocity vectors used by generate_data(), one row per message. These are constructed once and assigned to the
+# generated messages as (read-only) row views, rather than allocating new arrays every time the data is generated.
+VELOCITY_BODY_MPS = np.array([[1.0, 2.0, 3.0],
+                              [4.0, 5.0, 6.0]])
+VELOCITY_BODY_MPS.setflags(write=False)
+
+VELOCITY_ENU_MPS = np.array([[14.0, 15.0, 16.0],
+                             [17.0, 18.0, 19.0]])
+VELOCITY_ENU_MPS.setflags(write=False)
+
+
+def encode_messages(messages) -> bytes:
+    # Encode all messages into a single buffer, rather than writing them to disk one message at a time.
+    encoder = FusionEngineEncoder()
+    buffer = bytearray()
+    for message in messages:
+        if isinstance(message, bytes):
+            buffer += message
+        else:
+            encoder.encode_into(buffer, len(buffer), message)
+    return bytes(buffer)
+
+
 def encode_generated_data(messages, data_path=None, return_dict=True):
+    # Note: Binary (`bytes`) content in `messages` will be written to the file as is. However, it is not filtered out of
+    # the returned result, and is not supported by message_list_to_dict() when `return_dict == True`.
     if data_path is not None:
-        encoder = FusionEngineEncoder()
         with open(data_path, 'wb') as f:
-            for message in messages:
-                if isinstance(message, bytes):
-                    f.write(message)
-                else:
-                    f.write(encoder.encode_message(message))
+            f.write(encode_messages(messages))
 
     if return_dict:
         return message_list_to_dict(messages)
     else:
-        return [m for m in messages if not isinstance(m, bytes)]
+        return list(messages)
 
 
-def generate_data(data_path=None, include_binary=False, return_dict=True):
-    messages = []
+def build_messages(include_binary=False):
+    # Build the complete list of content to be written to disk (FusionEngine messages and interleaved binary data) and
+    # the list of FusionEngine messages only at the same time, so the binary content never needs to be filtered out.
+    all_messages = []
+    non_binary_messages = []
 
-    if include_binary:
-        messages.append(b'12345')
+    def add(message):
+        all_messages.append(message)
+        non_binary_messages.append(message)
+
+    def add_binary(data):
+        if include_binary:
+            all_messages.append(data)
+
+    add_binary(b'12345')
 
     message = EventNotificationMessage()
     message.system_time_ns = 1000000000
-    messages.append(message)
+    add(message)
 
     message = PoseMessage()
     message.p1_time = Timestamp(1.0)
-    message.velocity_body_mps = np.array([1.0, 2.0, 3.0])
-    messages.append(message)
+    message.velocity_body_mps = VELOCITY_BODY_MPS[0]
+    add(message)
 
-    if include_binary:
-        messages.append(b'12345')
+    add_binary(b'12345')
 
     message = PoseMessage()
     message.p1_time = Timestamp(2.0)
-    message.velocity_body_mps = np.array([4.0, 5.0, 6.0])
-    messages.append(message)
+    message.velocity_body_mps = VELOCITY_BODY_MPS[1]
+    add(message)
 
     message = PoseAuxMessage()
     message.p1_time = Timestamp(2.0)
-    message.velocity_enu_mps = np.array([14.0, 15.0, 16.0])
-    messages.append(message)
+    message.velocity_enu_mps = VELOCITY_ENU_MPS[0]
+    add(message)
 
     message = GNSSInfoMessage()
     message.p1_time = Timestamp(2.0)
     message.gdop = 5.0
-    messages.append(message)
+    add(message)
 
-    if include_binary:
-        messages.append(b'12345')
+    add_binary(b'12345')
 
     message = EventNotificationMessage()
     message.system_time_ns = 3000000000
-    messages.append(message)
+    add(message)
 
     message = PoseAuxMessage()
     message.p1_time = Timestamp(3.0)
-    message.velocity_enu_mps = np.array([17.0, 18.0, 19.0])
-    messages.append(message)
+    message.velocity_enu_mps = VELOCITY_ENU_MPS[1]
+    add(message)
 
-    if include_binary:
-        messages.append(b'12345')
+    add_binary(b'12345')
 
     message = GNSSInfoMessage()
     message.p1_time = Timestamp(3.0)
     message.gdop = 6.0
-    messages.append(message)
+    add(message)
 
     message = EventNotificationMessage()
     message.system_time_ns = 4000000000
-    messages.append(message)
+    add(message)
+
+    add_binary(b'12345')
+
+    return all_messages, non_binary_messages
+
+
+def _encode_test_data(include_binary):
+    all_messages, non_binary_messages = build_messages(include_binary=include_binary)
+    return encode_messages(all_messages), non_binary_messages
+
+
+# The data returned by generate_data() never changes, so we build and encode it once at import time, both with and
+# without interleaved binary content, instead of every time it is requested.
+ENCODED_DATA = {include_binary: _encode_test_data(include_binary) for include_binary in (False, True)}
 
-    if include_binary:
-        messages.append(b'12345')
 
-    return encode_generated_data(messages, data_path=data_path, return_dict=return_dict)
+def generate_data(include_binary=False, return_dict=True):
+    _, messages = ENCODED_DATA[include_binary]
+    if return_dict:
+        return message_list_to_dict(messages)
+    else:
+        return list(messages)
 
 
 def message_list_to_dict(messages):
+    # Note: `messages` must not contain any binary (`bytes`) content.
     result = {}
     for message in messages:
-        if isinstance(message, bytes):
-            continue
-
-        if message.get_type() not in result:
-            result[message.get_type()] = MessageData(message.get_type(), None)
-        result[message.get_type()].messages.append(message)
+        message_type = message.get_type()
+        entry = result.get(message_type)
+        if entry is None:
+            entry = result[message_type] = MessageData(message_type, None)
+        entry.messages.append(message)
     return result
 
 
@@ -113,32 +160,72 @@ def filter_by_time(messages, time_range: TimeRange):
     return result
 
 
+def to_ns(time_sec):
+    # Timestamps are serialized as integer seconds and nanoseconds, so decoded times should match the originals to the
+    # nanosecond. Round the floating point seconds values to the nearest nanosecond (still stored as floats, with NaN
+    # for missing times) and compare those exactly, rather than comparing the seconds values with a relative tolerance.
+    return np.round(np.asarray(time_sec) * 1e9)
+
+
+@pytest.fixture(scope='session')
+def encoded_data(tmp_path_factory):
+    # Write the encoded test data to disk once for the entire session. Tests make their own copy of these files, since
+    # reading the file may generate an index file next to it. The files written here are never modified, so this is
+    # safe to run in parallel with pytest-xdist (each worker has its own session and temporary directory).
+    data_dir = tmp_path_factory.mktemp('encoded_data')
+    result = {}
+    for include_binary, (data, messages) in ENCODED_DATA.items():
+        path = data_dir / ('test_file_binary.p1log' if include_binary else 'test_file.p1log')
+        path.write_bytes(data)
+        result[include_binary] = (path, messages)
+    return result
+
+
 class TestReader:
     @pytest.fixture
     def data_path(self, tmpdir):
         data_path = tmpdir.join('test_file.p1log')
         yield data_path
 
+    def _generate_data(self, data_path, encoded_data, include_binary=False):
+        path, messages = encoded_data[include_binary]
+        # Note: shutil.copyfile() already uses sendfile()/fcopyfile() where available, and a buffered copy elsewhere.
+        shutil.copyfile(str(path), str(data_path))
+        return list(messages)
+
     def _check_message(self, message, expected_message):
         assert message.get_type() == expected_message.get_type()
 
         expected_p1_time = expected_message.get_p1_time()
         if expected_p1_time is not None:
-            assert float(message.get_p1_time()) == pytest.approx(expected_p1_time, 1e-6)
+            if expected_p1_time:
+                assert to_ns(float(message.get_p1_time())) == to_ns(float(expected_p1_time))
+            else:
+                assert not message.get_p1_time()
 
-        expected_system_time_sec = expected_message.get_system_time_sec()
-        if expected_system_time_sec is not None:
-            assert float(message.get_system_time_sec()) == pytest.approx(expected_system_time_sec, 1e-6)
+        expected_system_time_ns = expected_message.get_system_time_ns()
+        if expected_system_time_ns is not None:
+            assert message.get_system_time_ns() == expected_system_time_ns
 
     def _check_dict_results(self, results: dict, expected_results: dict):
         expected_types = list(expected_results.keys())
         for message_type, message_data in results.items():
             if message_type in expected_types:
                 expected_data = expected_results[message_type]
-                self._check_messagedata_results(message_data, expected_data)
+                self._check_message_type_results(message_data, expected_data)
             else:
                 assert len(message_data.messages) == 0
 
+    def _check_message_type_results(self, results: MessageData, expected_results: MessageData):
+        # All messages here are of the same type, so we can compare the timestamps for all of them in a single call
+        # instead of one message at a time.
+        assert results.message_type == expected_results.message_type
+        assert len(results.messages) == len(expected_results.messages)
+
+        np.testing.assert_array_equal(to_ns(results.get_p1_time_sec()), to_ns(expected_results.get_p1_time_sec()))
+        np.testing.assert_array_equal(to_ns(results.get_system_time_sec()),
+                                      to_ns(expected_results.get_system_time_sec()))
+
     def _check_messagedata_results(self, results: MessageData, expected_results: MessageData):
         assert len(results.messages) == len(expected_results.messages)
         for message, expected_message in zip(results.messages, expected_results.messages):
@@ -150,8 +237,8 @@ class TestReader:
         else:
             self._check_dict_results(results, expected_results)
 
-    def test_read_all(self, data_path):
-        expected_messages = generate_data(data_path=str(data_path), include_binary=False, return_dict=False)
+    def test_read_all(self, data_path, encoded_data):
+        expected_messages = self._generate_data(data_path, encoded_data, include_binary=False)
         expected_result = message_list_to_dict(expected_messages)
 
         # Construct a reader. This will attempt to generate an index and set t0 immediately by scanning the data file.
@@ -166,8 +253,89 @@ class TestReader:
         assert len(reader.reader._original_index) == len(expected_messages)
         assert len(reader.reader.index) == len(expected_messages)
 
-    def test_read_all_with_index(self, data_path):
-        expected_messages = generate_data(data_path=str(data_path), include_binary=False, return_dict=False)
+    def test_close(self, data_path, encoded_data):
+        self._generate_data(data_path, encoded_data, include_binary=False)
+
+        # Closing the DataLoader should close the underlying reader and its file.
+        reader = DataLoader(path=str(data_path))
+        mixed_log_reader = reader.reader
+        reader.close()
+        assert reader.reader is None
+        assert mixed_log_reader.input_file.closed
+
+    def test_reopen_cached_system_t0(self, data_path, encoded_data, monkeypatch):
+        self._generate_data(data_path, encoded_data, include_binary=False)
+
+        reader = DataLoader(path=str(data_path))
+        system_t0_ns = reader.get_system_t0_ns()
+        assert system_t0_ns is not None
+
+        # Opening the same (unmodified) file again should reuse the system t0 found above, without reading the file.
+        read_calls = []
+        original_read = DataLoader.read
+
+        def _read(self, *args, **kwargs):
+            read_calls.append(kwargs)
+            return original_read(self, *args, **kwargs)
+
+        monkeypatch.setattr(DataLoader, 'read', _read)
+        reader = DataLoader(path=str(data_path))
+        assert reader.get_system_t0_ns() == system_t0_ns
+        assert reader.get_system_t0() == system_t0_ns * 1e-9
+        assert len(read_calls) == 0
+
+        # Clearing the index cache should also clear the stored system t0.
+        fast_indexer.clear_index_cache()
+        reader = DataLoader(path=str(data_path))
+        assert reader.get_system_t0_ns() == system_t0_ns
+        assert len(read_calls) == 1
+
+    @pytest.mark.parametrize("use_index", [False, True])
+    def test_t0_search_skips_untimed_messages(self, data_path, use_index, monkeypatch):
+        # Generate a file where unrequested messages with no P1 or system timestamps come before the first timestamped
+        # messages.
+        messages = [CommandResponseMessage() for _ in range(3)]
+
+        message = PoseMessage()
+        message.p1_time = Timestamp(1.0)
+        messages.append(message)
+
+        message = EventNotificationMessage()
+        message.system_time_ns = 2000000000
+        messages.append(message)
+
+        message = PoseMessage()
+        message.p1_time = Timestamp(2.0)
+        messages.append(message)
+
+        # If use_index is False, ignore any existing index file and index the file in memory without saving it.
+        encode_generated_data(messages, data_path=str(data_path))
+        if use_index:
+            MixedLogReader.generate_index_file(str(data_path))
+
+        # Record any attempt to decode the untimed messages. They should be skipped using the index while establishing
+        # t0, without being read or decoded.
+        decoded_untimed_messages = []
+        unpack = CommandResponseMessage.unpack
+
+        def _unpack(message, *args, **kwargs):
+            decoded_untimed_messages.append(message)
+            return unpack(message, *args, **kwargs)
+
+        monkeypatch.setattr(CommandResponseMessage, 'unpack', _unpack)
+
+        reader = DataLoader(path=str(data_path), save_index=use_index, ignore_index=not use_index)
+        assert float(reader.get_t0()) == 1.0
+        assert reader.get_system_t0_ns() == 2000000000
+
+        expected_result = message_list_to_dict(messages[3:])
+        result = reader.read(message_types=[PoseMessage, EventNotificationMessage])
+        self._check_results(result, expected_result)
+
+        assert len(decoded_untimed_messages) == 0
+
+    def test_read_all_with_index(self, data_path, encoded_data):
+        expected_messages = self._generate_data(data_path, encoded_data, include_binary=False)
         expected_result = message_list_to_dict(expected_messages)
 
         MixedLogReader.generate_index_file(str(data_path))
@@ -182,8 +350,8 @@ class TestReader:
         result = reader.read()
         self._check_results(result, expected_result)
 
-    def test_read_pose(self, data_path):
-        messages = generate_data(data_path=str(data_path), include_binary=False, return_dict=False)
+    def test_read_pose(self, data_path, encoded_data):
+        messages = self._generate_data(data_path, encoded_data, include_binary=False)
         expected_messages = [m for m in messages if isinstance(m, PoseMessage)]
         expected_result = message_list_to_dict(expected_messages)
 
@@ -195,8 +363,8 @@ class TestReader:
         assert len(reader.reader._original_index) == len(messages)
         assert len(reader.reader.index) == len(expected_messages)
 
-    def test_read_pose_with_index(self, data_path):
-        messages = generate_data(data_path=str(data_path), include_binary=False, return_dict=False)
+    def test_read_pose_with_index(self, data_path, encoded_data):
+        messages = self._generate_data(data_path, encoded_data, include_binary=False)
         expected_messages = [m for m in messages if isinstance(m, PoseMessage)]
         expected_result = message_list_to_dict(expected_messages)
 
@@ -208,8 +376,8 @@ class TestReader:
         result = reader.read(message_types=PoseMessage)
         self._check_results(result, expected_result)
 
-    def test_read_pose_mixed_binary(self, data_path):
-        messages = generate_data(data_path=str(data_path), include_binary=True, return_dict=False)
+    def test_read_pose_mixed_binary(self, data_path, encoded_data):
+        messages = self._generate_data(data_path, encoded_data, include_binary=True)
         expected_messages = [m for m in messages if isinstance(m, PoseMessage)]
         expected_result = message_list_to_dict(expected_messages)
 
@@ -221,8 +389,8 @@ class TestReader:
         assert len(reader.reader._original_index) == len(messages)
         assert len(reader.reader.index) == len(expected_messages)
 
-    def test_read_in_order(self, data_path):
-        messages = generate_data(data_path=str(data_path), include_binary=False, return_dict=False)
+    def test_read_in_order(self, data_path, encoded_data):
+        messages = self._generate_data(data_path, encoded_data, include_binary=False)
         expected_messages = [m for m in messages if m.get_type() in (MessageType.POSE, MessageType.EVENT_NOTIFICATION)]
         expected_result = message_list_to_messagedata(expected_messages)
 
@@ -232,8 +400,8 @@ class TestReader:
         self._check_results(result, expected_result)
         assert reader.reader.have_index()
 
-    def test_read_in_order_with_index(self, data_path):
-        messages = generate_data(data_path=str(data_path), include_binary=False, return_dict=False)
+    def test_read_in_order_with_index(self, data_path, encoded_data):
+        messages = self._generate_data(data_path, encoded_data, include_binary=False)
         expected_messages = [m for m in messages if m.get_type() in (MessageType.POSE, MessageType.EVENT_NOTIFICATION)]
         expected_result = message_list_to_messagedata(expected_messages)
 
@@ -256,9 +424,9 @@ class TestReader:
         '1.0:2.0:abs',
     ])
     @pytest.mark.parametrize("use_index", [False, True])
-    def test_time_range(self, data_path, time_range, use_index):
+    def test_time_range(self, data_path, encoded_data, time_range, use_index):
         time_range = TimeRange.parse(time_range)
-        messages = generate_data(data_path=str(data_path), include_binary=False, return_dict=False)
+        messages = self._generate_data(data_path, encoded_data, include_binary=False)
         expected_messages = filter_by_time(messages, time_range)
         expected_result = message_list_to_dict(expected_messages)
         if use_index:
@@ -269,8 +437,8 @@ class TestReader:
 
     @pytest.mark.parametrize("max_messages", [1, 3, -1, -1])
     @pytest.mark.parametrize("use_index", [False, True])
-    def test_max_messages(self, data_path, max_messages, use_index):
-        messages = generate_data(data_path=str(data_path), include_binary=False, return_dict=False)
+    def test_max_messages(self, data_path, encoded_data, max_messages, use_index):
+        messages = self._generate_data(data_path, encoded_data, include_binary=False)
 
         if use_index:
             MixedLogReader.generate_index_file(str(data_path))
@@ -298,6 +466,22 @@ class TestReader:
         self._check_results(result, expected_result)
 
 
+class TestMessageData:
+    def test_get_times(self):
+        data = generate_data()
+
+        pose_data = data[PoseMessage.MESSAGE_TYPE]
+        assert np.array_equal(pose_data.get_p1_time_sec(), [1.0, 2.0])
+        assert np.all(np.isnan(pose_data.get_system_time_sec()))
+
+        event_data = data[EventNotificationMessage.MESSAGE_TYPE]
+        assert np.all(np.isnan(event_data.get_p1_time_sec()))
+        assert np.allclose(event_data.get_system_time_sec(), [1.0, 3.0, 4.0])
+
+        empty_data = MessageData(PoseMessage.MESSAGE_TYPE, None)
+        assert len(empty_data.get_p1_time_sec()) == 0
+
+
 class TestTimeAlignment:
     @pytest.fixture
     def data(self):
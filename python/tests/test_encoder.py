@@ -1,6 +1,9 @@
 import numpy as np
+import pytest
 
-from fusion_engine_client.messages import PoseMessage, PoseAuxMessage
+from fusion_engine_client.messages import (CommandResponseMessage, GetConfigMessage, GNSSInfoMessage, HeadingOutput,
+                                           PoseAuxMessage, PoseMessage, RawHeadingOutput)
+from fusion_engine_client.messages.ros import ROSGPSFixMessage, ROSIMUMessage, ROSPoseMessage
 from fusion_engine_client.parsers import FusionEngineEncoder
 from fusion_engine_client.utils import trace as logging
 
@@ -9,6 +12,9 @@ logging.basicConfig(level=logging.INFO,
 logging.getLogger('point_one').setLevel(logging.DEBUG)
 
 
+VELOCITY_BODY_MPS = np.array([1.0, 2.0, 3.0])
+VELOCITY_BODY_MPS.setflags(write=False)
+
 P1_POSE_MESSAGE1 = b".1\x00\x00\xc0@\xdb\x1a\x02\x01\x10'\x00\x00\x00\x00\x8c\x00\x00\x00\x00\x00\x00\x00\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\x00\x00\x00\x80\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\xc0\x7f\x00\x00\xc0\x7f\x00\x00\xc0\x7f\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\xc0\x7f\x00\x00\xc0\x7f\x00\x00\xc0\x7f\x00\x00\x00\x00\x00\x00\xf0?\x00\x00\x00\x00\x00\x00\x00@\x00\x00\x00\x00\x00\x00\x08@\x00\x00\xc0\x7f\x00\x00\xc0\x7f\x00\x00\xc0\x7f\x00\x00\xc0\x7f\x00\x00\xc0\x7f\x00\x00\xc0\x7f"
 P1_POSE_MESSAGE2 = b".1\x00\x00q\x95\xfd\x8a\x02\x01\x10'\x01\x00\x00\x00\x8c\x00\x00\x00\x00\x00\x00\x00\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\x00\x00\x00\x80\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\xc0\x7f\x00\x00\xc0\x7f\x00\x00\xc0\x7f\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\xc0\x7f\x00\x00\xc0\x7f\x00\x00\xc0\x7f\x00\x00\x00\x00\x00\x00\xf0?\x00\x00\x00\x00\x00\x00\x00@\x00\x00\x00\x00\x00\x00\x08@\x00\x00\xc0\x7f\x00\x00\xc0\x7f\x00\x00\xc0\x7f\x00\x00\xc0\x7f\x00\x00\xc0\x7f\x00\x00\xc0\x7f"
 P1_POSE_AUX_MESSAGE3 = b".1\x00\x00\xac\xa4\x08\x94\x02\x00\x13'\x02\x00\x00\x00\xa0\x00\x00\x00\x00\x00\x00\x00\xff\xff\xff\xff\xff\xff\xff\xff\x00\x00\xc0\x7f\x00\x00\xc0\x7f\x00\x00\xc0\x7f\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\x00\x00\x00\x00\xf8\x7f\x00\x00\xc0\x7f\x00\x00\xc0\x7f\x00\x00\xc0\x7f"
@@ -17,7 +23,7 @@ P1_POSE_AUX_MESSAGE3 = b".1\x00\x00\xac\xa4\x08\x94\x02\x00\x13'\x02\x00\x00\x00
 def test_pose_encode():
     encoder = FusionEngineEncoder()
     pose = PoseMessage()
-    pose.velocity_body_mps = np.array([1.0, 2.0, 3.0])
+    pose.velocity_body_mps = VELOCITY_BODY_MPS
     pose_aux = PoseAuxMessage()
 
     data = encoder.encode_message(pose)
@@ -26,3 +32,36 @@ def test_pose_encode():
     assert data == P1_POSE_MESSAGE2
     data = encoder.encode_message(pose_aux)
     assert data == P1_POSE_AUX_MESSAGE3
+
+
+def test_encode_into():
+    pose = PoseMessage()
+    pose.velocity_body_mps = VELOCITY_BODY_MPS
+    pose_aux = PoseAuxMessage()
+
+    encoder = FusionEngineEncoder()
+    buffer = bytearray()
+    offset = encoder.encode_into(buffer, 0, pose)
+    assert offset == len(P1_POSE_MESSAGE1)
+    offset = encoder.encode_into(buffer, offset, pose)
+    offset = encoder.encode_into(buffer, offset, pose_aux)
+    assert offset == len(buffer)
+    assert buffer == P1_POSE_MESSAGE1 + P1_POSE_MESSAGE2 + P1_POSE_AUX_MESSAGE3
+
+
+@pytest.mark.parametrize("message_cls", [
+    PoseMessage, GNSSInfoMessage, CommandResponseMessage, GetConfigMessage, HeadingOutput, RawHeadingOutput,
+    ROSPoseMessage, ROSGPSFixMessage, ROSIMUMessage,
+])
+def test_encode_into_offset(message_cls):
+    expected_data = FusionEngineEncoder().encode_message(message_cls())
+
+    # Encode into a nonzero offset within a preallocated buffer. The message should be written in place, without
+    # growing the buffer or modifying the surrounding content.
+    buffer = bytearray(b'\xff' * (len(expected_data) + 8))
+    offset = FusionEngineEncoder().encode_into(buffer, 4, message_cls())
+    assert offset == 4 + len(expected_data)
+    assert len(buffer) == len(expected_data) + 8
+    assert buffer[4:offset] == expected_data
+    assert buffer[:4] == b'\xff' * 4
+    assert buffer[offset:] == b'\xff' * 4
@@ -4,7 +4,7 @@ import os
 import pytest
 
 from fusion_engine_client.messages import *
-from fusion_engine_client.parsers import FusionEngineEncoder, MixedLogReader, FileIndex
+from fusion_engine_client.parsers import FusionEngineEncoder, MixedLogReader, FileIndex, fast_indexer
 from fusion_engine_client.utils.time_range import TimeRange
 
 
@@ -180,6 +180,22 @@ class TestClass:
         assert reader.index is not None and len(reader.index) == len(expected_messages)
         assert len(reader._original_index) == len(messages)
 
+    def test_close(self, data_path):
+        messages = self._generate_mixed_data(data_path)
+
+        # Closing the reader should close the file it opened.
+        reader = MixedLogReader(str(data_path))
+        self._check_results(reader, messages)
+        reader.close()
+        assert reader.input_file.closed
+
+        # A file object provided by the caller should be left open.
+        with open(data_path, 'rb') as f:
+            reader = MixedLogReader(f)
+            self._check_results(reader, messages)
+            reader.close()
+            assert not f.closed
+
     def test_return_message_index(self, data_path):
         messages = self._generate_mixed_data(data_path)
 
@@ -251,6 +267,41 @@ class TestClass:
         assert reader.index is not None and len(reader.index) == len(expected_messages)
         assert len(reader._original_index) == len(messages)
 
+    def test_read_cached_index(self, data_path):
+        self._generate_mixed_data(data_path)
+
+        # Reading the same file a second time should reuse the index already loaded by this process.
+        reader = MixedLogReader(str(data_path))
+        index = reader.get_index()
+        reader = MixedLogReader(str(data_path))
+        assert reader.get_index() is index
+
+        # If the file is modified, it should be reindexed.
+        messages = self._generate_mixed_data_with_binary(data_path)
+        expected_messages = [m for m in messages if isinstance(m, PoseMessage)]
+        reader = MixedLogReader(str(data_path))
+        assert reader.get_index() is not index
+
+        reader.filter_in_place((PoseMessage,))
+        self._check_results(reader, expected_messages)
+
+    def test_index_cache_limit(self, tmpdir):
+        fast_indexer.clear_index_cache()
+
+        # Only the most recently used indexes should be kept in memory.
+        paths = [str(tmpdir.join(f'test_file_{i}.p1log')) for i in range(fast_indexer._INDEX_CACHE_MAX_ENTRIES + 1)]
+        indexes = []
+        for path in paths:
+            self._generate_mixed_data(path)
+            indexes.append(MixedLogReader(path).get_index())
+        assert len(fast_indexer._INDEX_CACHE) == fast_indexer._INDEX_CACHE_MAX_ENTRIES
+        assert MixedLogReader(paths[0]).get_index() is not indexes[0]
+        assert MixedLogReader(paths[-1]).get_index() is indexes[-1]
+
+        fast_indexer.clear_index_cache()
+        assert len(fast_indexer._INDEX_CACHE) == 0
+        assert MixedLogReader(paths[-1]).get_index() is not indexes[-1]
+
     def test_read_ignore_index(self, data_path):
         messages = self._generate_mixed_data(data_path)
         expected_messages = [m for m in messages if isinstance(m, PoseMessage)]